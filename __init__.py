@@ -1,4 +1,4 @@
 """ Root of the package """  # pylint: disable=invalid-name
-from src.async_python_runner import AsyncRunner
+from src import AsyncRunner
 
 __all__ = ["AsyncRunner"]
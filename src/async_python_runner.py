@@ -1,7 +1,7 @@
 """ This script is used to run all the sub-processes in the sub_processes directory.
 
 Usage - standalone:
-    python async_process_runner.py
+    python async_python_runner.py
 
     Default values:
         sub_process_dir: sub_processes
@@ -9,9 +9,9 @@ Usage - standalone:
         logging_dir: logs
 
 Usage - module:
-    import async_process_runner
+    import async_python_runner
 
-    runner = async_process_runner.AsyncProcessRunner()
+    runner = async_python_runner.AsyncRunner()
     runner.run()
 """
 import logging
@@ -22,39 +22,82 @@ import multiprocessing
 import argparse
 import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from types import ModuleType
 from helpers.directory_searcher import get_files
 from models.custom_process import CustomProcess
+from models.run_mode import RunMode
+from models.spawn_mode import SpawnMode
+from models.spawned_process import SpawnedProcess
 
 logging.basicConfig(level=logging.INFO)
 
 
-class AsyncRunner:
+def _cached_import(module_path: str) -> ModuleType:
+    """Return an already imported module from sys.modules, importing it otherwise."""
+    if (module := sys.modules.get(module_path)) is None:
+        module = importlib.import_module(module_path)
+    return module
+
+
+class AsyncRunner:  # pylint: disable=too-many-instance-attributes
     """Class to asynchronously run and manage multiple subprocesses."""
 
-    FILES_TO_IGNORE = ["__init__.py", "__pycache__", "__init__"]
+    FILES_TO_IGNORE = frozenset({"__init__.py", "__pycache__", "__init__"})
     ROOT_DIR = os.path.dirname(os.path.realpath(__file__))
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         sub_process_dir: str = "sub_processes",
         main_method: str = "main",
         logging_dir: (str | None) = None,
+        mode: RunMode | str = RunMode.THREAD,
+        start_method: (str | None) = None,
+        spawn_mode: SpawnMode | str = SpawnMode.MULTIPROCESSING,
     ):
-        """Initializes an AsyncProcessRunner instance.
+        """Initializes an AsyncRunner instance.
 
         Args:
             sub_process_dir (str): Directory containing the subprocesses.
             Default is 'sub_processes'.
+            mode (RunMode | str): 'thread' runs every subprocess in a shared thread
+            pool, 'process' runs each one in its own multiprocessing.Process for
+            CPU-bound work. Default is 'thread'.
+            start_method (str | None): multiprocessing start method used in process
+            mode, e.g. 'forkserver' to fork children from a prewarmed server.
+            Default is the platform default.
+            spawn_mode (SpawnMode | str): how process mode launches children.
+            'posix_spawn' starts a fresh interpreter per module with os.posix_spawn
+            instead of multiprocessing, falling back to multiprocessing where
+            posix_spawn is unavailable (e.g. Windows). Default is 'multiprocessing'.
         """
 
         self.sub_process_dir = sub_process_dir
         self.main_method = main_method
+        self.mode = RunMode(mode)
+        self.spawn_mode = SpawnMode(spawn_mode)
+        if self.mode is RunMode.THREAD and (
+            start_method is not None or self.spawn_mode is not SpawnMode.MULTIPROCESSING
+        ):
+            logging.warning(
+                "start_method and spawn_mode only apply to process mode, ignoring them"
+            )
+        elif self.spawn_mode is SpawnMode.POSIX_SPAWN:
+            if not hasattr(os, "posix_spawn"):
+                logging.warning("posix_spawn is unavailable, using multiprocessing")
+            elif start_method is not None:
+                logging.warning(
+                    "start_method does not apply to posix_spawn, ignoring it"
+                )
+        self.mp_context = multiprocessing.get_context(start_method)
+        self.executor: ThreadPoolExecutor | None = None
         if logging_dir is None:
             self.logging_dir = os.path.join(self.ROOT_DIR, "logs")
         else:
             self.logging_dir = logging_dir
         self.processes: list[CustomProcess] = []
+        self._module_cache: dict[str, ModuleType] = {}
+        self.file_handler: logging.FileHandler | None = None
 
     def get_sub_processes(self) -> list[ModuleType]:
         """Retrieve subprocesses from the directory.
@@ -65,57 +108,125 @@ class AsyncRunner:
         modules: list[ModuleType] = []
         list_of_modules, module_path = get_files(self.ROOT_DIR, self.sub_process_dir)
 
-        updated_modules: list[str] = []
-
-        for module_names in list_of_modules:
-            if module_names in self.FILES_TO_IGNORE:
-                list_of_modules.remove(module_names)
-                continue
-            if module_names.endswith(".py"):
-                # remove the .py extension
-                updated_modules.append(module_names[:-3])
+        files_to_ignore = self.FILES_TO_IGNORE
+        # remove the .py extension
+        updated_modules: list[str] = [
+            module_name[:-3]
+            for module_name in list_of_modules
+            if module_name.endswith(".py") and module_name not in files_to_ignore
+        ]
 
         logging.info("Modules to be imported: %s", updated_modules)
         logging.info("Module path: %s", module_path)
 
-        module_base_name = "."
+        prefix = ".".join(module_path)
 
         for module in updated_modules:
             # combine the module path with the module name
-            combined_module_path = module_path + [module]
-
-            full_module_path = module_base_name.join(combined_module_path)
-            print(full_module_path, module)
-            modules.append(importlib.import_module(full_module_path, self.main_method))
+            full_module_path = f"{prefix}.{module}" if prefix else module
+            if (imported := self._module_cache.get(full_module_path)) is None:
+                imported = _cached_import(full_module_path)
+                self._module_cache[full_module_path] = imported
+            modules.append(imported)
 
         return modules
 
     def create_sub_processes(self) -> None:
-        """Initializes subprocess instances from discovered modules."""
-        for module in self.get_sub_processes():
-            process = multiprocessing.Process(target=module.main)
-            self.processes.append(CustomProcess(module.__name__, process))
+        """Initializes subprocess instances from discovered modules.
+
+        Trackers of a previous run are replaced, so a runner can be run repeatedly.
+        """
+        self._shutdown_executor()
+        self.processes = []
+        method_name = self.main_method
+        entry_points = [
+            (module.__name__, getattr(module, method_name))
+            for module in self.get_sub_processes()
+        ]
+
+        if (
+            self.mode is RunMode.PROCESS
+            and self.spawn_mode is SpawnMode.POSIX_SPAWN
+            and hasattr(os, "posix_spawn")
+        ):
+            # the child has to find the modules on the same path as this interpreter
+            python_path = os.pathsep.join(path for path in sys.path if path)
+            env = dict(os.environ, PYTHONPATH=python_path)
+            for name, _entry_point in entry_points:
+                code = (
+                    "import importlib; "
+                    f"getattr(importlib.import_module({name!r}), {method_name!r})()"
+                )
+                process = SpawnedProcess([sys.executable, "-c", code], env)
+                self.processes.append(CustomProcess(name, process))
+            return
+
+        if self.mode is RunMode.PROCESS:
+            for name, entry_point in entry_points:
+                process = self.mp_context.Process(target=entry_point)
+                self.processes.append(CustomProcess(name, process))
+            return
+
+        if not entry_points:
+            return
+
+        self.executor = ThreadPoolExecutor(max_workers=len(entry_points))
+        for name, entry_point in entry_points:
+            self.processes.append(CustomProcess(name, entry_point, self.executor))
+
+    @staticmethod
+    async def _run(process: CustomProcess) -> None:
+        """Starts a subprocess and waits for it to finish."""
+        process.start()
+        await process.join()
 
     async def main(self) -> None:
         """Main method that initializes and starts all subprocesses."""
         self.create_sub_processes()
-        tasks = [
-            task
-            for task in (
-                [p.start() for p in self.processes] + [p.join() for p in self.processes]
-            )
-            if task is not None
-        ]
+        try:
+            await asyncio.gather(*[self._run(p) for p in self.processes])
+        finally:
+            self._shutdown_executor()
+
+    def _shutdown_executor(self) -> None:
+        """Releases the thread pool of the current run, if any."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def setup_logging(self) -> None:
+        """Attaches a file handler for the logging directory to the root logger.
+
+        logging.basicConfig is a no-op once the root logger has handlers, so the
+        handler is added explicitly. It is only attached once, even across runners
+        sharing the same log file.
+        """
+        if self.file_handler is not None:
+            return
 
-        await asyncio.gather(*tasks)
+        os.makedirs(self.logging_dir, exist_ok=True)
+        log_file = os.path.abspath(
+            os.path.join(self.logging_dir, "async_python_runner.log")
+        )
+        root_logger = logging.getLogger()
+
+        for handler in root_logger.handlers:
+            if (
+                isinstance(handler, logging.FileHandler)
+                and handler.baseFilename == log_file
+            ):
+                self.file_handler = handler
+                return
+
+        self.file_handler = logging.FileHandler(log_file)
+        self.file_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+        root_logger.addHandler(self.file_handler)
 
     def run(self) -> None:
         """Sets up logging and runs the main asynchronous method."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            filename=os.path.join(self.logging_dir, "async_python_runner.log"),
-        )
+        self.setup_logging()
         logging.info("Starting main process")
         asyncio.run(self.main())
         logging.info("Main process completed")
@@ -137,7 +248,10 @@ Example:\n
     async_python_runner -d /User/testing/sub_processes -m main -l /temp/logs\n
 \n
 This will run all the python files in the /User/testing/sub_processes directory
-asynchronously and log the output to the /temp/logs/async_python_runner.log file.
+asynchronously and log the output to the /temp/logs/async_python_runner.log file.\n
+\n
+Subprocesses share a thread pool by default. Pass --mode process to run each one in
+its own process for CPU-bound work.
     """
 
     parser = argparse.ArgumentParser(
@@ -168,12 +282,36 @@ asynchronously and log the output to the /temp/logs/async_python_runner.log file
         default="logs",
         help="The path to the logging directory",
     )
-    args = parser.parse_args(sys.argv[1:3])
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=[mode.value for mode in RunMode],
+        default=RunMode.THREAD.value,
+        help="Run the sub-processes in a shared thread pool or in separate processes.",
+    )
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        choices=multiprocessing.get_all_start_methods(),
+        default=None,
+        help="The multiprocessing start method used in process mode.",
+    )
+    parser.add_argument(
+        "--spawn-mode",
+        type=str,
+        choices=[spawn_mode.value for spawn_mode in SpawnMode],
+        default=SpawnMode.MULTIPROCESSING.value,
+        help="How process mode launches the sub-processes.",
+    )
+    args = parser.parse_args(sys.argv[1:])
 
     runner = AsyncRunner(
         sub_process_dir=str(args.sub_processes_dir),
         main_method=str(args.main_method),
         logging_dir=str(args.logging_dir),
+        mode=args.mode,
+        start_method=args.start_method,
+        spawn_mode=args.spawn_mode,
     )
     runner.run()
 
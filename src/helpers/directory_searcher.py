@@ -1,26 +1,89 @@
 """ This class is used to search directories for the target directory and get all the 
 files in it."""
+import functools
+import itertools
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePath
 from models.file_status import FileStatus
 
 
-FILES_TO_IGNORE: list[str] = ["__init__.py", "__pycache__"]
+FILES_TO_IGNORE: frozenset[str] = frozenset({"__init__.py", "__pycache__"})
 ROOT_DIR = os.getcwd()
+CACHE_TTL: float = 30.0
+SCAN_WORKERS: int = 8
+SLOW_SCAN_SECONDS: float = 0.001
+
+_DIR_CACHE: dict[tuple[str, str], tuple[float, tuple[list[str], list[str]]]] = {}
+
+
+def invalidate() -> None:
+    """Drop all cached directory listings, e.g. after files were added or removed."""
+    _DIR_CACHE.clear()
+
+
+def _scan_dir(path: str) -> list[os.DirEntry[str]]:
+    """List a directory, treating unreadable directories as empty."""
+    try:
+        return list(os.scandir(path))
+    except OSError:
+        return []
+
+
+@functools.cache
+def _scan_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all directory scans, created on first use."""
+    return ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="find_dir")
 
 
 def find_dir(start_dir: str, target_dir: str) -> tuple[str, str]:
-    """Find a directory recursively starting from a given path."""
-    for root, dirs, _ in os.walk(start_dir):
-        if target_dir in dirs:
-            possible_path = os.path.join(root, target_dir)
-            relative_path = os.path.relpath(possible_path, start_dir)
-            return relative_path, possible_path
+    """Find a directory breadth-first starting from a given path.
+
+    Uses os.scandir so directory entries are classified from the dirent type without
+    an extra stat per file, and stops at the first match. On high-latency
+    filesystems such as network mounts, where scanning the first directory of a
+    level takes longer than SLOW_SCAN_SECONDS, the rest of the level is scanned in a
+    shared thread pool since scandir releases the GIL. Local disks stay serial.
+    """
+    frontier = [start_dir]
+    # pylint: disable=while-used
+    while frontier:
+        next_frontier: list[str] = []
+        started = time.perf_counter()
+        first_entries = _scan_dir(frontier[0])
+        slow = time.perf_counter() - started > SLOW_SCAN_SECONDS
+        # both variants yield in frontier order, so the first match is the same
+        remaining = (
+            _scan_executor().map(_scan_dir, frontier[1:])
+            if slow and len(frontier) > 1
+            else (_scan_dir(path) for path in frontier[1:])
+        )
+        for entries in itertools.chain([first_entries], remaining):
+            for entry in entries:
+                if entry.name == target_dir and entry.is_dir():
+                    relative_path = os.path.relpath(entry.path, start_dir)
+                    return relative_path, entry.path
+                if entry.is_dir(follow_symlinks=False):
+                    next_frontier.append(entry.path)
+        frontier = next_frontier
     return FileStatus.NOT_FOUND.value, FileStatus.NOT_FOUND.value
 
 
 def get_files(start_dir: str, target_dir: str) -> tuple[list[str], list[str]]:
-    """Get all files in the target directory."""
+    """Get all files in the target directory.
+
+    Results are cached per (start_dir, target_dir) for CACHE_TTL seconds, call
+    invalidate() to force a fresh scan.
+    """
+    cache_key = (start_dir, target_dir)
+    now = time.monotonic()
+    cached = _DIR_CACHE.get(cache_key)
+    if cached is not None and now - cached[0] < CACHE_TTL:
+        files, relative_parts = cached[1]
+        return list(files), list(relative_parts)
+
     logging.info("Searching for %s directory...", target_dir)
 
     relative_path, absolute_path = find_dir(start_dir, target_dir)
@@ -28,11 +91,16 @@ def get_files(start_dir: str, target_dir: str) -> tuple[list[str], list[str]]:
     if relative_path == FileStatus.NOT_FOUND.value:
         return [], ["not found"]
 
-    files = [
-        file_name
-        for file_name in os.listdir(absolute_path)
-        if os.path.isfile(os.path.join(absolute_path, file_name))
-        and file_name.endswith(".py")
-    ]
+    files_to_ignore = FILES_TO_IGNORE
+    with os.scandir(absolute_path) as entries:
+        files = [
+            entry.name
+            for entry in entries
+            if entry.is_file()
+            and entry.name.endswith(".py")
+            and entry.name not in files_to_ignore
+        ]
+    relative_parts = list(PurePath(relative_path).parts)
 
-    return files, relative_path.split(os.sep)
+    _DIR_CACHE[cache_key] = (now, (files, relative_parts))
+    return list(files), list(relative_parts)
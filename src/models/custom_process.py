@@ -3,33 +3,191 @@
 This module contains the CustomProcess class definition.
 
 """
+import asyncio
+import json
 import multiprocessing
 import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+from typing import Any
 from .process_status import ProcessStatus
+from .spawned_process import SpawnedProcess
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # pylint: disable=invalid-name
 
-class CustomProcess:
+
+def _format_time(value: datetime | None) -> dict[str, Any] | None:
+    """Timestamp and human readable form of a datetime."""
+    if value is None:
+        return None
+    return {
+        "timestamp": value.timestamp(),
+        "human_readable": value.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+class CustomProcess:  # pylint: disable=too-many-instance-attributes
     """Representative class for subprocesses, encapsulating their management."""
 
-    def __init__(self, name: str, process: multiprocessing.Process):
+    __slots__ = (
+        "name",
+        "process",
+        "executor",
+        "future",
+        "status",
+        "start_time",
+        "end_time",
+        "run_duration",
+        "_t0",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        process: multiprocessing.Process | SpawnedProcess | Callable[[], Any],
+        executor: Executor | None = None,
+    ):
         """Initializes a CustomProcess instance.
 
         Args:
             name (str): Name of the subprocess.
-            process (multiprocessing.Process): Multiprocessing instance to run.
+            process (multiprocessing.Process | SpawnedProcess | Callable): Process
+            instance to run, or the entry point to submit to the executor.
+            executor (Executor | None): Executor running the entry point. Default
+            is None, meaning process is a process instance.
         """
         self.name = name
         self.process = process
+        self.executor = executor
+        self.future: asyncio.Future[Any] | None = None
         self.status = ProcessStatus.NOT_STARTED
+        self.start_time: datetime | None = None
+        self.end_time: datetime | None = None
+        self.run_duration: timedelta | None = None
+        self._t0: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the status and timing of the subprocess as a plain dict."""
+        return {
+            "name": self.name,
+            "status": self.status.name,
+            "start_time": _format_time(self.start_time),
+            "end_time": _format_time(self.end_time),
+            "run_duration": None
+            if self.run_duration is None
+            else {
+                "total_seconds": self.run_duration.total_seconds(),
+                "human_readable": str(self.run_duration),
+            },
+        }
+
+    def to_json(self) -> str:
+        """Serializes to_dict() as JSON, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(), option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+            ).decode()
+        return json.dumps(self.to_dict(), sort_keys=True, indent=2)
 
     def start(self) -> None:
-        """Starts the subprocess."""
+        """Starts the subprocess.
+
+        Entry points are submitted to the executor here, so this has to be called
+        from within a running event loop when an executor is set.
+        """
         self.status = ProcessStatus.RUNNING
+        self._t0 = time.perf_counter()
+        self.start_time = datetime.now()
         logging.info("%s started", self.name)
-        self.process.start()
+        if self.executor is None:
+            self.process.start()
+        else:
+            loop = asyncio.get_running_loop()
+            self.future = loop.run_in_executor(self.executor, self.process)
 
-    def join(self) -> None:
-        """Waits for the subprocess to finish execution."""
+    async def join(self) -> None:
+        """Waits for the subprocess to finish execution without blocking the loop.
+
+        Executor-backed subprocesses await their future; an exception raised by the
+        entry point, or a sys.exit() with a non-zero code, is logged and marks the
+        subprocess as failed instead of tearing down the runner. Child processes
+        are marked as failed when they exit with a non-zero exit code. Cancelling
+        the join kills and reaps the child process and marks it as killed, whatever
+        the backend.
+        """
+        if self.executor is not None:
+            if self.future is None:
+                raise RuntimeError(f"{self.name} has not been started")
+            try:
+                await self.future
+            except SystemExit as exit_request:
+                if exit_request.code not in (None, 0):
+                    logging.error("%s exited with %s", self.name, exit_request.code)
+                    self._record_end(ProcessStatus.FAILED)
+                    return
+            except Exception:  # pylint: disable=broad-exception-caught
+                logging.exception("%s failed", self.name)
+                self._record_end(ProcessStatus.FAILED)
+                return
+        else:
+            await self._wait_for_exit()
+            if self.process.exitcode:
+                logging.error("%s exited with %s", self.name, self.process.exitcode)
+                self._record_end(ProcessStatus.FAILED)
+                return
+
+        self._record_end(ProcessStatus.COMPLETED)
+        logging.info("%s finished in %s", self.name, self.run_duration)
+
+    def _record_end(self, status: ProcessStatus) -> None:
+        """Records the final status, the end time and the monotonic run duration."""
+        self.end_time = datetime.now()
+        if self._t0 is not None:
+            self.run_duration = timedelta(seconds=time.perf_counter() - self._t0)
+        self.status = status
+
+    async def _wait_for_exit(self) -> None:
+        """Waits for the child process to exit and reaps it."""
+        try:
+            await self._wait_for_sentinel()
+        except asyncio.CancelledError:
+            # a cancelled run must not leave its child behind
+            self.process.kill()
+            self.process.join()
+            self._record_end(ProcessStatus.KILLED)
+            raise
         self.process.join()
-        logging.info("%s finished", self.name)
-        self.status = ProcessStatus.COMPLETED
+
+    async def _wait_for_sentinel(self) -> None:
+        """Waits until the process sentinel becomes readable, i.e. the child exited.
+
+        Event loops without ``add_reader`` support (e.g. the Windows proactor loop),
+        and processes without a sentinel, fall back to joining in the default
+        executor.
+        """
+        loop = asyncio.get_running_loop()
+        if (sentinel := self.process.sentinel) is None:
+            await loop.run_in_executor(None, self.process.join)
+            return
+        finished: asyncio.Future[None] = loop.create_future()
+
+        def on_exit() -> None:
+            if not finished.done():
+                finished.set_result(None)
+
+        try:
+            loop.add_reader(sentinel, on_exit)
+        except NotImplementedError:
+            await loop.run_in_executor(None, self.process.join)
+            return
+
+        try:
+            await finished
+        finally:
+            # also runs on cancellation so no reader is left behind on the loop
+            loop.remove_reader(sentinel)
@@ -1,9 +1,13 @@
-"""Enum-like class representing the status of a process."""
-import dataclasses
+"""This is a enum for process status."""
 
+import enum
 
-@dataclasses.dataclass
-class ProcessStatus:
-    """Enum-like class representing the status of a process."""
 
-    NOT_STARTED, RUNNING, COMPLETED, FAILED, KILLED = range(5)
+class ProcessStatus(enum.IntEnum):
+    """Enum for process status."""
+
+    NOT_STARTED = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
+    KILLED = 4
@@ -0,0 +1,10 @@
+"""This is a enum for the run mode of the subprocesses."""
+
+import enum
+
+
+class RunMode(str, enum.Enum):
+    """Enum for the run mode of the subprocesses."""
+
+    THREAD = "thread"
+    PROCESS = "process"
@@ -0,0 +1,10 @@
+"""This is a enum for how child processes are launched."""
+
+import enum
+
+
+class SpawnMode(str, enum.Enum):
+    """Enum for how child processes are launched."""
+
+    MULTIPROCESSING = "multiprocessing"
+    POSIX_SPAWN = "posix_spawn"
@@ -0,0 +1,87 @@
+"""SpawnedProcess class definition.
+
+This module contains the SpawnedProcess class definition, a minimal stand-in for
+multiprocessing.Process that launches a command with os.posix_spawn.
+
+"""
+import contextlib
+import os
+import signal
+import threading
+from collections.abc import Mapping
+
+
+class SpawnedProcess:
+    """Child process started with os.posix_spawn, exposing the Process interface
+    used by CustomProcess (start, join, kill, sentinel, pid and exitcode)."""
+
+    __slots__ = ("argv", "env", "pid", "sentinel", "exitcode", "_reap_lock")
+
+    def __init__(self, argv: list[str], env: Mapping[str, str] | None = None):
+        """Initializes a SpawnedProcess instance.
+
+        Args:
+            argv (list[str]): Command to run, argv[0] being the executable path.
+            env (Mapping[str, str] | None): Environment of the child. Default is
+            the current environment.
+        """
+        self.argv = argv
+        self.env = os.environ if env is None else env
+        self.pid: int | None = None
+        self.sentinel: int | None = None
+        self.exitcode: int | None = None
+        self._reap_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Spawns the child process.
+
+        The sentinel becomes readable once the child exits. On Linux it is a pidfd,
+        elsewhere it is the read end of a pipe whose write end only the child holds.
+        """
+        if self.pid is not None:
+            raise RuntimeError("cannot start a process twice")
+        if not hasattr(os, "pidfd_open"):
+            self._start_with_pipe()
+            return
+        self.pid = os.posix_spawn(self.argv[0], self.argv, self.env)
+        try:
+            self.sentinel = os.pidfd_open(self.pid)
+        except OSError:
+            # kernels before 5.3, join falls back to a blocking wait
+            self.sentinel = None
+
+    def _start_with_pipe(self) -> None:
+        """Spawns the child with the inheritable write end of a pipe as sentinel."""
+        read_fd, write_fd = os.pipe()
+        os.set_inheritable(write_fd, True)
+        try:
+            self.pid = os.posix_spawn(self.argv[0], self.argv, self.env)
+        except OSError:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self.sentinel = read_fd
+
+    def join(self) -> None:
+        """Waits for the child process to exit and reaps it.
+
+        Safe to call from several threads, e.g. the event loop and an executor
+        thread blocked in a fallback join: only the first caller waits on the pid.
+        """
+        with self._reap_lock:
+            if self.pid is None or self.exitcode is not None:
+                return
+            _, status = os.waitpid(self.pid, 0)
+            self.exitcode = os.waitstatus_to_exitcode(status)
+            if self.sentinel is not None:
+                os.close(self.sentinel)
+                self.sentinel = None
+
+    def kill(self) -> None:
+        """Sends SIGKILL to the child process if it has not been reaped yet."""
+        if self.pid is None or self.exitcode is not None:
+            return
+        # a concurrent join may reap the child between the check and the signal
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(self.pid, signal.SIGKILL)
@@ -1,15 +1,29 @@
 """ Unit tests for the AsyncRunner and CustomProcess classes.
 """
-from datetime import timedelta
+import asyncio
+from collections.abc import Awaitable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import errno
+import json
+import logging
+import multiprocessing
 from multiprocessing import Process
 import os
 import random
+import shutil
+import signal
+import sys
 import time
 import pytest
-from async_python_runner import AsyncRunner
+from async_python_runner import AsyncRunner, main as cli_main
 from models.custom_process import CustomProcess
+from models.file_status import FileStatus
 from models.process_status import ProcessStatus
-from helpers.directory_searcher import get_files
+from models.run_mode import RunMode
+from models.spawn_mode import SpawnMode
+from models.spawned_process import SpawnedProcess
+from helpers import directory_searcher
+from helpers.directory_searcher import find_dir, get_files, invalidate
 
 
 ROOT_DIR = os.getcwd()
@@ -18,16 +32,43 @@ PROCESS_DIR = "sub_process"
 
 RELATIVE_DIR = "src/test/sub_process"
 
+FAILING_PROCESS_DIR = "failing_process"
+
+FAILING_RELATIVE_DIR = "src/test/failing_process"
+
+# module name -> body of its main()
+FAILING_PROCESSES = {
+    "exit_zero": "raise SystemExit(0)",
+    "exit_three": "raise SystemExit(3)",
+    "raises": 'raise ValueError("boom")',
+}
+
+FAILING_PROCESS_STATUSES = {
+    "exit_zero": ProcessStatus.COMPLETED,
+    "exit_three": ProcessStatus.FAILED,
+    "raises": ProcessStatus.FAILED,
+}
+
+ENTRY_POINT_PROCESS_DIR = "entry_point_process"
+
+ENTRY_POINT_RELATIVE_DIR = "src/test/entry_point_process"
+
+ENTRY_POINT = "run"
+
 FILES_TO_IGNORE = ["__init__.py", "__pycache__"]
 
+TIMEOUT_SECONDS = 5.0
 
-def check_timeout(timeout: timedelta) -> bool:
-    """Function to timeout the process."""
-    time.sleep(1)
-    timeout -= timedelta(seconds=1)
-    if timeout == timedelta(seconds=0):
-        return True
-    return False
+SHORT_SLEEP_SECONDS = 0.2
+IGNORED_OPTION_WARNING = "ignoring"
+
+
+async def wait_or_fail(awaitable: Awaitable[object], message: str) -> None:
+    """Awaits within TIMEOUT_SECONDS, failing the test with message otherwise."""
+    try:
+        await asyncio.wait_for(awaitable, timeout=TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        pytest.fail(message)
 
 
 def test_process() -> None:
@@ -35,6 +76,21 @@ def test_process() -> None:
     print("Hello, world!")
 
 
+def sleeping_process() -> None:
+    """Target that outlives the join timeout used in the tests."""
+    time.sleep(5)
+
+
+def unsupported_pidfd_open(pid: int) -> int:
+    """Stand-in for os.pidfd_open on kernels without pidfd support."""
+    raise OSError(errno.ENOSYS, f"pidfd_open({pid}) is not implemented")
+
+
+def short_sleep() -> None:
+    """Target that takes a measurable amount of time."""
+    time.sleep(SHORT_SLEEP_SECONDS)
+
+
 def custom_async_process() -> CustomProcess:
     """Fixture for the CustomProcess class."""
     process: Process = Process(target=test_process)
@@ -52,8 +108,7 @@ def main() -> None:
 '''
     number_of_processes = random.randint(5, 15)
 
-    if not os.path.exists(os.path.join(ROOT_DIR, RELATIVE_DIR)):
-        os.mkdir(os.path.join(ROOT_DIR, RELATIVE_DIR))
+    os.makedirs(os.path.join(ROOT_DIR, RELATIVE_DIR), exist_ok=True)
 
     _process_files, relative_dir = get_files(ROOT_DIR, PROCESS_DIR)
 
@@ -66,6 +121,63 @@ def main() -> None:
         ) as file:
             file.write(custom_process)
 
+    invalidate()
+
+
+@pytest.fixture(name="failing_sub_processes")
+def fixture_failing_sub_processes() -> Iterator[None]:
+    """Creates sub-processes that exit cleanly, exit non-zero or raise, and removes
+    them after the test."""
+
+    failing_dir = os.path.join(ROOT_DIR, FAILING_RELATIVE_DIR)
+    os.makedirs(failing_dir, exist_ok=True)
+
+    for module_name, body in FAILING_PROCESSES.items():
+        with open(
+            os.path.join(failing_dir, f"{module_name}.py"), "w", encoding="utf-8"
+        ) as file:
+            file.write(f"def main() -> None:\n    {body}\n")
+
+    invalidate()
+    yield
+    shutil.rmtree(failing_dir, ignore_errors=True)
+    invalidate()
+
+
+@pytest.fixture(name="entry_point_marker")
+def fixture_entry_point_marker(tmp_path) -> Iterator[str]:
+    """Creates a sub-process whose ENTRY_POINT writes a marker file, and removes it
+    after the test. Yields the path of the marker file."""
+
+    entry_point_dir = os.path.join(ROOT_DIR, ENTRY_POINT_RELATIVE_DIR)
+    os.makedirs(entry_point_dir, exist_ok=True)
+    marker = str(tmp_path / "marker")
+
+    with open(
+        os.path.join(entry_point_dir, "custom_entry_point.py"), "w", encoding="utf-8"
+    ) as file:
+        file.write(
+            "from pathlib import Path\n\n\n"
+            "def main() -> None:\n"
+            '    raise AssertionError("main must not run")\n\n\n'
+            f"def {ENTRY_POINT}() -> None:\n"
+            f"    Path({marker!r}).write_text("
+            f"{ENTRY_POINT!r}, encoding='utf-8')\n"
+        )
+
+    invalidate()
+    yield marker
+    shutil.rmtree(entry_point_dir, ignore_errors=True)
+    invalidate()
+
+
+def module_statuses(runner: AsyncRunner) -> dict[str, ProcessStatus]:
+    """Maps the module name of every tracked subprocess to its status."""
+    return {
+        active_process.name.rsplit(".", 1)[-1]: active_process.status
+        for active_process in runner.processes
+    }
+
 
 def custom_async_process_runner_folder() -> AsyncRunner:
     """Custom definition for the AsyncRunner class."""
@@ -85,20 +197,42 @@ async def test_custom_process() -> None:
     print(async_process.name)
 
     async_process.start()
-    async_process.join()
+
+    await wait_or_fail(async_process.join(), "process did not finish in time")
 
     print(async_process.status)
 
-    timeout = timedelta(seconds=5)
+    assert async_process.status == ProcessStatus.COMPLETED
+    assert async_process.start_time is not None
+    assert async_process.end_time is not None
+    assert async_process.start_time <= async_process.end_time
+    assert async_process.run_duration is not None
+    assert async_process.run_duration.total_seconds() > 0
+
+    status = json.loads(async_process.to_json())
+    assert status["name"] == async_process.name
+    assert status["status"] == ProcessStatus.COMPLETED.name
+    assert status["run_duration"]["total_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_custom_process_executor() -> None:
+    """Test that executor-backed entry points only run once started."""
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        async_process = CustomProcess("short_sleep", short_sleep, executor)
+
+        assert async_process.status == ProcessStatus.NOT_STARTED
+        assert async_process.future is None
+
+        async_process.start()
+        assert async_process.future is not None
 
-    # wait until the process is completed
-    # Disabling pylint warning because this is a listener
-    # pylint: disable=while-used
-    while async_process.status != ProcessStatus.COMPLETED:
-        if check_timeout(timeout):
-            assert False
+        await wait_or_fail(async_process.join(), "process did not finish in time")
 
     assert async_process.status == ProcessStatus.COMPLETED
+    assert async_process.run_duration is not None
+    assert async_process.run_duration.total_seconds() >= SHORT_SLEEP_SECONDS
 
 
 @pytest.mark.asyncio
@@ -109,27 +243,311 @@ async def test_async_process_runner_folder() -> None:
 
     async_process_runner = custom_async_process_runner_folder()
 
-    await async_process_runner.main()
+    await wait_or_fail(async_process_runner.main(), "processes did not finish in time")
+
+    # confirm all processes are completed
+    for active_process in async_process_runner.processes:
+        assert active_process.status == ProcessStatus.COMPLETED
+
 
-    process_status: list[int] = []
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "start_method, spawn_mode",
+    [
+        (None, "multiprocessing"),
+        ("forkserver", "multiprocessing"),
+        (None, "posix_spawn"),
+    ],
+)
+@pytest.mark.usefixtures("failing_sub_processes")
+async def test_async_process_runner_process_mode(
+    start_method: str | None, spawn_mode: str
+) -> None:
+    """Test function for the AsyncRunner class running real subprocesses."""
 
-    finished_process = 0
+    create_sub_processes()
 
+    async_process_runner = AsyncRunner(
+        PROCESS_DIR, mode="process", start_method=start_method, spawn_mode=spawn_mode
+    )
+
+    await wait_or_fail(async_process_runner.main(), "processes did not finish in time")
+
+    assert async_process_runner.processes
     for active_process in async_process_runner.processes:
-        process_status.append(active_process.status)
+        assert active_process.status == ProcessStatus.COMPLETED
+        assert active_process.process.exitcode == 0
 
-    timeout = timedelta(seconds=5)
+    failing_runner = AsyncRunner(
+        FAILING_PROCESS_DIR,
+        mode="process",
+        start_method=start_method,
+        spawn_mode=spawn_mode,
+    )
 
-    # wait until all processes are completed
-    # Disabling pylint warning because this is a listener
-    # pylint: disable=while-used
-    while finished_process != len(async_process_runner.processes):
-        for active_process in async_process_runner.processes:
-            if active_process.status == ProcessStatus.COMPLETED:
-                finished_process += 1
-        if check_timeout(timeout):
-            assert False
+    await wait_or_fail(failing_runner.main(), "processes did not finish in time")
 
-    # confirm all processes are completed
-    for active_process in async_process_runner.processes:
+    assert module_statuses(failing_runner) == FAILING_PROCESS_STATUSES
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("failing_sub_processes")
+async def test_async_process_runner_thread_mode_failures() -> None:
+    """Test that failing entry points are recorded without stopping the runner."""
+
+    async_process_runner = AsyncRunner(FAILING_PROCESS_DIR)
+
+    await wait_or_fail(async_process_runner.main(), "processes did not finish in time")
+
+    assert module_statuses(async_process_runner) == FAILING_PROCESS_STATUSES
+
+
+def test_get_files_cache(tmp_path) -> None:
+    """Test that get_files serves cached listings until invalidated."""
+
+    target_dir = tmp_path / PROCESS_DIR
+    target_dir.mkdir()
+    (target_dir / "first.py").write_text("", encoding="utf-8")
+
+    files, relative_dir = get_files(str(tmp_path), PROCESS_DIR)
+    assert files == ["first.py"]
+    assert relative_dir == [PROCESS_DIR]
+
+    (target_dir / "second.py").write_text("", encoding="utf-8")
+    assert get_files(str(tmp_path), PROCESS_DIR)[0] == ["first.py"]
+
+    invalidate()
+    assert sorted(get_files(str(tmp_path), PROCESS_DIR)[0]) == ["first.py", "second.py"]
+
+
+@pytest.mark.parametrize("slow_scan_seconds", [60.0, -1.0])
+def test_find_dir_nested(tmp_path, monkeypatch, slow_scan_seconds: float) -> None:
+    """Test that find_dir returns the shallowest match in a nested tree, both when
+    scanning serially and when every level goes through the thread pool."""
+
+    monkeypatch.setattr(directory_searcher, "SLOW_SCAN_SECONDS", slow_scan_seconds)
+
+    for package in ("alpha", "beta", "gamma"):
+        (tmp_path / package / "nested").mkdir(parents=True)
+    (tmp_path / "beta" / "nested" / PROCESS_DIR).mkdir()
+    (tmp_path / "gamma" / PROCESS_DIR).mkdir()
+
+    relative_path, absolute_path = find_dir(str(tmp_path), PROCESS_DIR)
+    assert relative_path == os.path.join("gamma", PROCESS_DIR)
+    assert absolute_path == str(tmp_path / "gamma" / PROCESS_DIR)
+
+    assert find_dir(str(tmp_path), "missing") == (
+        FileStatus.NOT_FOUND.value,
+        FileStatus.NOT_FOUND.value,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("spawned", "use_pidfd"),
+    [(False, True), (True, True), (True, False)],
+    ids=["multiprocessing", "posix_spawn", "posix_spawn_without_pidfd"],
+)
+async def test_custom_process_cancelled_join(
+    monkeypatch, spawned: bool, use_pidfd: bool
+) -> None:
+    """Test that a cancelled join kills and reaps the child on every backend,
+    without leaving the sentinel reader registered."""
+
+    if not use_pidfd:
+        # kernels before 5.3, the child has no sentinel and is joined in a thread
+        monkeypatch.setattr(os, "pidfd_open", unsupported_pidfd_open, raising=False)
+
+    process = (
+        SpawnedProcess([sys.executable, "-c", "import time; time.sleep(5)"])
+        if spawned
+        else Process(target=sleeping_process)
+    )
+    async_process = CustomProcess("sleeping_process", process)
+    async_process.start()
+    sentinel = process.sentinel
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(async_process.join(), timeout=0.1)
+
+    if sentinel is not None:
+        assert not asyncio.get_running_loop().remove_reader(sentinel)
+    assert process.exitcode == -signal.SIGKILL
+    assert async_process.status == ProcessStatus.KILLED
+
+
+@pytest.mark.asyncio
+async def test_async_process_runner_main_method() -> None:
+    """Test that the configured main method is used as the entry point."""
+
+    create_sub_processes()
+
+    async_process_runner = AsyncRunner(PROCESS_DIR, main_method="missing")
+
+    with pytest.raises(AttributeError):
+        await async_process_runner.main()
+
+
+@pytest.mark.asyncio
+async def test_async_process_runner_custom_main_method(entry_point_marker: str) -> None:
+    """Test that a non-default main method is the one that runs."""
+
+    async_process_runner = AsyncRunner(ENTRY_POINT_PROCESS_DIR, main_method=ENTRY_POINT)
+
+    await wait_or_fail(async_process_runner.main(), "processes did not finish in time")
+
+    assert module_statuses(async_process_runner) == {
+        "custom_entry_point": ProcessStatus.COMPLETED
+    }
+    with open(entry_point_marker, encoding="utf-8") as file:
+        assert file.read() == ENTRY_POINT
+
+
+@pytest.mark.parametrize(
+    ("options", "spawn_mode", "start_method"),
+    [
+        (["--start-method", "spawn"], SpawnMode.MULTIPROCESSING, "spawn"),
+        (["--spawn-mode", "posix_spawn"], SpawnMode.POSIX_SPAWN, None),
+    ],
+)
+def test_cli_process_mode(
+    monkeypatch,
+    tmp_path,
+    options: list[str],
+    spawn_mode: SpawnMode,
+    start_method: str | None,
+) -> None:
+    """Test that the command line options reach the AsyncRunner."""
+
+    runners: list[AsyncRunner] = []
+
+    def record_run(runner: AsyncRunner) -> None:
+        runners.append(runner)
+
+    monkeypatch.setattr(AsyncRunner, "run", record_run)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["async_python_runner", "-l", str(tmp_path), "--mode", "process", *options],
+    )
+
+    cli_main()
+
+    assert len(runners) == 1
+    assert runners[0].mode is RunMode.PROCESS
+    assert runners[0].spawn_mode is spawn_mode
+    assert runners[0].mp_context is multiprocessing.get_context(start_method)
+
+
+def test_setup_logging(tmp_path) -> None:
+    """Test that the log file handler is attached exactly once."""
+
+    logging_dir = tmp_path / "logs"
+    root_logger = logging.getLogger()
+
+    first_runner = AsyncRunner(PROCESS_DIR, logging_dir=str(logging_dir))
+    second_runner = AsyncRunner(PROCESS_DIR, logging_dir=str(logging_dir))
+
+    first_runner.setup_logging()
+    first_runner.setup_logging()
+    second_runner.setup_logging()
+
+    file_handler = first_runner.file_handler
+    assert file_handler is not None
+    attached = root_logger.handlers.count(file_handler)
+    root_logger.removeHandler(file_handler)
+    file_handler.close()
+
+    assert logging_dir.is_dir()
+    assert second_runner.file_handler is file_handler
+    assert attached == 1
+
+
+@pytest.mark.parametrize(
+    ("mode", "start_method", "spawn_mode", "warned"),
+    [
+        ("thread", "spawn", "multiprocessing", True),
+        ("thread", None, "posix_spawn", True),
+        ("thread", None, "multiprocessing", False),
+        ("process", "spawn", "multiprocessing", False),
+        ("process", "forkserver", "posix_spawn", True),
+        ("process", None, "posix_spawn", False),
+    ],
+)
+def test_process_only_options_warning(
+    caplog, mode: str, start_method: str | None, spawn_mode: str, warned: bool
+) -> None:
+    """Test that options ignored by the chosen mode are reported."""
+
+    with caplog.at_level(logging.WARNING):
+        AsyncRunner(
+            PROCESS_DIR, mode=mode, start_method=start_method, spawn_mode=spawn_mode
+        )
+
+    assert (IGNORED_OPTION_WARNING in caplog.text) is warned
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_pidfd", [True, False])
+async def test_spawned_process_sentinel(monkeypatch, use_pidfd: bool) -> None:
+    """Test that spawned processes are awaited through a sentinel on POSIX."""
+
+    if not use_pidfd:
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+    elif not hasattr(os, "pidfd_open"):
+        pytest.skip("pidfd_open is unavailable")
+
+    spawned_process = SpawnedProcess([sys.executable, "-c", "pass"])
+    async_process = CustomProcess("spawned_process", spawned_process)
+    async_process.start()
+
+    assert spawned_process.sentinel is not None
+
+    await wait_or_fail(async_process.join(), "process did not finish in time")
+
+    assert async_process.status == ProcessStatus.COMPLETED
+    assert spawned_process.exitcode == 0
+    assert spawned_process.sentinel is None
+
+
+def test_get_sub_processes_reuses_modules() -> None:
+    """Test that repeated discovery returns the same module objects."""
+
+    create_sub_processes()
+
+    async_process_runner = custom_async_process_runner_folder()
+
+    first_modules = async_process_runner.get_sub_processes()
+    second_modules = async_process_runner.get_sub_processes()
+
+    assert first_modules
+    assert [id(module) for module in first_modules] == [
+        id(module) for module in second_modules
+    ]
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_async_process_runner_run_twice(tmp_path, mode: str) -> None:
+    """Test that a runner can be run repeatedly with fresh trackers."""
+
+    create_sub_processes()
+
+    async_process_runner = AsyncRunner(
+        PROCESS_DIR, logging_dir=str(tmp_path), mode=mode
+    )
+
+    async_process_runner.run()
+    first_processes = async_process_runner.processes
+    async_process_runner.run()
+    second_processes = async_process_runner.processes
+
+    if async_process_runner.file_handler is not None:
+        logging.getLogger().removeHandler(async_process_runner.file_handler)
+        async_process_runner.file_handler.close()
+
+    number_of_modules = len(async_process_runner.get_sub_processes())
+    assert len(first_processes) == number_of_modules
+    assert len(second_processes) == number_of_modules
+    assert async_process_runner.executor is None
+    for active_process in first_processes + second_processes:
         assert active_process.status == ProcessStatus.COMPLETED